@@ -1,9 +1,9 @@
 import os
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import Response
 
-from src.services.thumbnails import generate_thumbnail, get_image_dimensions
+from src.services.thumbnails import generate_thumbnail, get_cache_key, get_image_dimensions
 
 router = APIRouter()
 
@@ -81,7 +81,7 @@ async def list_folders():
 
 
 @router.get("/{path:path}/thumbnail")
-async def get_thumbnail(path: str, size: int = 200):
+async def get_thumbnail(request: Request, path: str, size: int = 200):
     """Get thumbnail for an image. Size parameter controls max dimension (default 200, max 1200)."""
     # Clamp size between 50 and 1200
     size = min(max(size, 50), 1200)
@@ -91,9 +91,17 @@ async def get_thumbnail(path: str, size: int = 200):
     if not is_valid_image(image_path):
         raise HTTPException(status_code=404, detail="Image not found")
 
+    # Cache key identifies the cached thumbnail, so it doubles as a strong ETag
+    headers = {
+        "ETag": f'"{get_cache_key(str(image_path), size)}"',
+        "Cache-Control": "public, max-age=3600",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
     try:
         thumbnail_data = generate_thumbnail(image_path, size)
-        return Response(content=thumbnail_data, media_type="image/jpeg")
+        return Response(content=thumbnail_data, media_type="image/jpeg", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
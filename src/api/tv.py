@@ -39,6 +39,10 @@ class SetCurrentRequest(BaseModel):
     content_id: str
 
 
+class ThumbnailsRequest(BaseModel):
+    content_ids: list[str]
+
+
 class PreviewRequest(BaseModel):
     paths: list[str]
     crop_percent: int = 0
@@ -197,11 +201,30 @@ async def get_artwork_thumbnail(content_id: str):
         if not thumbnail_data:
             raise HTTPException(status_code=404, detail="Thumbnail not found")
         return Response(content=thumbnail_data, media_type="image/jpeg")
+    except HTTPException:
+        raise
     except Exception as e:
         # Thumbnail retrieval often times out for built-in Samsung content
         raise HTTPException(status_code=503, detail=str(e))
 
 
+@router.post("/artwork/thumbnails")
+async def prefetch_artwork_thumbnails(request: ThumbnailsRequest):
+    """Fetch and cache thumbnails for several artworks in batched TV round-trips.
+
+    Cached thumbnails are then served by GET /artwork/{content_id}/thumbnail.
+    """
+    client = require_tv_client()
+    try:
+        thumbnails = await asyncio.to_thread(client.get_thumbnails, request.content_ids)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "cached": list(thumbnails),
+        "missing": [cid for cid in request.content_ids if cid not in thumbnails]
+    }
+
+
 @router.post("/preview")
 async def preview_processed(request: PreviewRequest):
     """Generate preview of processed images (cropped + matted)."""
@@ -1,11 +1,16 @@
 import asyncio
+import functools
+import gzip
 import hashlib
 import logging
 import os
+import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
+import urllib.parse
 import urllib.request
 import json
 
@@ -15,11 +20,27 @@ MET_API_BASE = "https://collectionapi.metmuseum.org/public/collection/v1"
 MET_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 DIMENSIONS_CACHE_DIR = Path(os.environ.get("THUMBNAILS_DIR", "/thumbnails")) / "met_dims"
 
+# urllib.parse.quote is pure Python; search terms and mediums repeat a lot
+_quote = functools.lru_cache(maxsize=1024)(urllib.parse.quote)
 
-@dataclass
+
+def _pack_json(value: any) -> bytes:
+    """Serialize a value to compact gzipped JSON for caching."""
+    return gzip.compress(json.dumps(value, separators=(",", ":")).encode(), compresslevel=1)
+
+
+def _unpack_json(data: bytes) -> any:
+    """Inverse of _pack_json."""
+    return json.loads(gzip.decompress(data))
+
+
+@dataclass(slots=True, frozen=True)
 class CacheEntry:
     data: any
     expires_at: float
+    # Validators from the response, used to revalidate once the entry expires
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 
 class MetClient:
@@ -29,6 +50,9 @@ class MetClient:
         self._cache: dict[str, CacheEntry] = {}
         self._departments_ttl = 86400  # 24 hours
         self._objects_ttl = 3600  # 1 hour
+        # In-flight requests by URL, so concurrent cache misses share one fetch
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
 
     def _get_cached(self, key: str) -> Optional[any]:
         """Get cached value if not expired."""
@@ -37,34 +61,115 @@ class MetClient:
             return entry.data
         return None
 
-    def _set_cached(self, key: str, data: any, ttl: int) -> None:
+    def _set_cached(
+        self,
+        key: str,
+        data: any,
+        ttl: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
         """Cache value with TTL."""
-        self._cache[key] = CacheEntry(data=data, expires_at=time.time() + ttl)
+        self._cache[key] = CacheEntry(
+            data=data,
+            expires_at=time.time() + ttl,
+            etag=etag,
+            last_modified=last_modified
+        )
+
+    def _fetch_json_cached(self, cache_key: str, url: str, ttl: int, extract=None) -> any:
+        """Get cached JSON, revalidating an expired entry with a conditional GET.
+
+        Values are stored as gzipped JSON bytes: object-ID lists can hold tens
+        of thousands of ints, which take far more memory as Python objects.
+        Use this for large responses only.
+
+        Args:
+            cache_key: Key the (extracted) value is cached under
+            url: URL to fetch on cache miss
+            ttl: Cache TTL in seconds
+            extract: Optional function mapping the response to the cached value
+        """
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return _unpack_json(cached)
+
+        stale = self._cache.get(cache_key)
+        data, etag, last_modified = self._fetch_json(url, stale)
+        if data is None:
+            # 304 Not Modified - keep the stored value for another TTL
+            _LOGGER.debug(f"Not modified: {url}")
+            self._set_cached(cache_key, stale.data, ttl, stale.etag, stale.last_modified)
+            return _unpack_json(stale.data)
+
+        value = extract(data) if extract else data
+        self._set_cached(cache_key, _pack_json(value), ttl, etag, last_modified)
+        return value
+
+    def _fetch_json(
+        self, url: str, stale: Optional[CacheEntry] = None
+    ) -> tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Fetch JSON from URL, coalescing concurrent requests for the same URL.
+
+        If a stale cache entry is given, its validators are sent along and
+        data is None when the server answers 304 Not Modified.
+
+        Returns: (data, etag, last_modified) tuple
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(url)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[url] = future
 
-    def _fetch_json(self, url: str) -> dict:
-        """Fetch JSON from URL."""
+        if not is_owner:
+            _LOGGER.debug(f"Joining in-flight request: {url}")
+            return future.result()
+
+        try:
+            result = self._request_json(url, stale)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[url]
+
+    def _request_json(
+        self, url: str, stale: Optional[CacheEntry] = None
+    ) -> tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Fetch JSON from URL, conditionally if a stale entry has validators."""
         _LOGGER.debug(f"Fetching: {url}")
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": MET_USER_AGENT,
-                "Accept": "application/json",
-            }
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode())
+        headers = {
+            "User-Agent": MET_USER_AGENT,
+            "Accept": "application/json",
+        }
+        if stale and stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale and stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=10) as response:
+                data = json.loads(response.read().decode())
+                return data, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, None, None
+            raise
 
     def get_departments(self) -> list[dict]:
         """Get list of museum departments. Cached for 24h."""
-        cache_key = "departments"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-
-        data = self._fetch_json(f"{MET_API_BASE}/departments")
-        departments = data.get("departments", [])
-        self._set_cached(cache_key, departments, self._departments_ttl)
-        return departments
+        return self._fetch_json_cached(
+            "departments",
+            f"{MET_API_BASE}/departments",
+            self._departments_ttl,
+            extract=lambda data: data.get("departments", [])
+        )
 
     def get_object(self, object_id: int, retries: int = 3) -> Optional[dict]:
         """Get single object details. Cached for 1h. Retries with backoff on 429."""
@@ -74,13 +179,17 @@ class MetClient:
             return cached
 
         url = f"{MET_API_BASE}/objects/{object_id}"
+        stale = self._cache.get(cache_key)
 
         for attempt in range(retries):
             try:
-                data = self._fetch_json(url)
+                data, etag, last_modified = self._fetch_json(url, stale)
+                if data is None:
+                    # 304 Not Modified - reuse the stored object
+                    data, etag, last_modified = stale.data, stale.etag, stale.last_modified
                 # Only cache if has image
                 if data.get("primaryImage") or data.get("primaryImageSmall"):
-                    self._set_cached(cache_key, data, self._objects_ttl)
+                    self._set_cached(cache_key, data, self._objects_ttl, etag, last_modified)
                 return data
             except urllib.error.HTTPError as e:
                 if e.code == 429 and attempt < retries - 1:
@@ -194,15 +303,12 @@ class MetClient:
 
     def _get_object_ids(self, endpoint: str, cache_key: str) -> list[int]:
         """Fetch and cache object IDs from search/objects endpoint."""
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-
-        data = self._fetch_json(endpoint)
-        object_ids = data.get("objectIDs") or []
-        # Cache for 1 hour
-        self._set_cached(cache_key, object_ids, self._objects_ttl)
-        return object_ids
+        return self._fetch_json_cached(
+            cache_key,
+            endpoint,
+            self._objects_ttl,
+            extract=lambda data: data.get("objectIDs") or []
+        )
 
     def get_highlights(self, page: int = 1, page_size: int = 24, medium: Optional[str] = None) -> dict:
         """Get highlighted artworks with images, paginated."""
@@ -231,8 +337,7 @@ class MetClient:
 
     def get_by_medium(self, medium: str, page: int = 1, page_size: int = 24, highlights_only: bool = False) -> dict:
         """Get artworks by medium (e.g., Paintings, Sculpture), paginated."""
-        import urllib.parse
-        encoded_medium = urllib.parse.quote(medium)
+        encoded_medium = _quote(medium)
 
         highlight_suffix = ":highlights" if highlights_only else ""
         cache_key = f"medium:{medium}{highlight_suffix}:ids"
@@ -282,30 +387,26 @@ class MetClient:
 
     def search(self, query: str, department_id: Optional[int] = None, medium: Optional[str] = None, highlights_only: bool = False, page: int = 1, page_size: int = 24) -> dict:
         """Search artworks by keyword, optionally filtered by department, medium, or highlights."""
-        import urllib.parse
-        encoded_query = urllib.parse.quote(query)
-
         # Build cache key and URL
         # IMPORTANT: q parameter must come LAST for Met API to work correctly
-        params = ["hasImages=true"]
+        params = {"hasImages": "true"}
         cache_parts = [f"search:{query}"]
 
         if department_id:
-            params.append(f"departmentId={department_id}")
+            params["departmentId"] = department_id
             cache_parts.append(f"dept:{department_id}")
         if medium:
-            encoded_medium = urllib.parse.quote(medium)
-            params.append(f"medium={encoded_medium}")
+            params["medium"] = medium
             cache_parts.append(f"medium:{medium}")
         if highlights_only:
-            params.append("isHighlight=true")
+            params["isHighlight"] = "true"
             cache_parts.append("highlights")
 
         # q must be last
-        params.append(f"q={encoded_query}")
+        params["q"] = query
 
         cache_key = ":".join(cache_parts) + ":ids"
-        url = f"{MET_API_BASE}/search?" + "&".join(params)
+        url = f"{MET_API_BASE}/search?" + urllib.parse.urlencode(params, safe="/", quote_via=_quote)
 
         all_ids = self._get_object_ids(url, cache_key)
 
@@ -353,8 +454,7 @@ class MetClient:
 
     async def get_by_medium_async(self, medium: str, page: int = 1, page_size: int = 24, highlights_only: bool = False) -> dict:
         """Get artworks by medium, paginated (async parallel fetch)."""
-        import urllib.parse
-        encoded_medium = urllib.parse.quote(medium)
+        encoded_medium = _quote(medium)
 
         highlight_suffix = ":highlights" if highlights_only else ""
         cache_key = f"medium:{medium}{highlight_suffix}:ids"
@@ -404,26 +504,22 @@ class MetClient:
 
     async def search_async(self, query: str, department_id: Optional[int] = None, medium: Optional[str] = None, highlights_only: bool = False, page: int = 1, page_size: int = 24) -> dict:
         """Search artworks by keyword (async parallel fetch)."""
-        import urllib.parse
-        encoded_query = urllib.parse.quote(query)
-
-        params = ["hasImages=true"]
+        params = {"hasImages": "true"}
         cache_parts = [f"search:{query}"]
 
         if department_id:
-            params.append(f"departmentId={department_id}")
+            params["departmentId"] = department_id
             cache_parts.append(f"dept:{department_id}")
         if medium:
-            encoded_medium = urllib.parse.quote(medium)
-            params.append(f"medium={encoded_medium}")
+            params["medium"] = medium
             cache_parts.append(f"medium:{medium}")
         if highlights_only:
-            params.append("isHighlight=true")
+            params["isHighlight"] = "true"
             cache_parts.append("highlights")
 
-        params.append(f"q={encoded_query}")
+        params["q"] = query
         cache_key = ":".join(cache_parts) + ":ids"
-        url = f"{MET_API_BASE}/search?" + "&".join(params)
+        url = f"{MET_API_BASE}/search?" + urllib.parse.urlencode(params, safe="/", quote_via=_quote)
 
         all_ids = await asyncio.to_thread(self._get_object_ids, url, cache_key)
         total = len(all_ids)
@@ -444,11 +540,10 @@ class MetClient:
 
     def fetch_image(self, image_url: str) -> bytes:
         """Download image bytes from Met servers."""
-        import urllib.parse
 
         # URL-encode path to handle spaces and special chars
         parsed = urllib.parse.urlparse(image_url)
-        encoded_path = urllib.parse.quote(parsed.path)
+        encoded_path = _quote(parsed.path)
         encoded_url = urllib.parse.urlunparse(parsed._replace(path=encoded_path))
 
         _LOGGER.info(f"Downloading image: {encoded_url}")
@@ -493,11 +588,10 @@ class MetClient:
         try:
             from PIL import Image
             from io import BytesIO
-            import urllib.parse
 
             # URL-encode path to handle spaces and special chars
             parsed = urllib.parse.urlparse(image_url)
-            encoded_path = urllib.parse.quote(parsed.path)
+            encoded_path = _quote(parsed.path)
             encoded_url = urllib.parse.urlunparse(parsed._replace(path=encoded_path))
 
             _LOGGER.debug(f"Fetching dimensions for: {encoded_url}")
@@ -524,13 +618,7 @@ class MetClient:
             return (0, 0)
 
 
-# Singleton instance
-_client: Optional[MetClient] = None
-
-
+@functools.cache
 def get_met_client() -> MetClient:
     """Get or create Met client singleton."""
-    global _client
-    if _client is None:
-        _client = MetClient()
-    return _client
+    return MetClient()
@@ -1,4 +1,5 @@
 """Cache for processed image previews."""
+import functools
 import hashlib
 import logging
 import os
@@ -159,13 +160,7 @@ class PreviewCache:
         }
 
 
-# Singleton instance
-_preview_cache: Optional[PreviewCache] = None
-
-
+@functools.cache
 def get_preview_cache() -> PreviewCache:
     """Get the singleton preview cache instance."""
-    global _preview_cache
-    if _preview_cache is None:
-        _preview_cache = PreviewCache()
-    return _preview_cache
+    return PreviewCache()
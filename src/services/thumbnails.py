@@ -1,9 +1,14 @@
 import hashlib
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from io import BytesIO
 from pathlib import Path
+from typing import Optional
 from PIL import Image
 
 logger = logging.getLogger(__name__)
@@ -12,13 +17,80 @@ THUMBNAIL_SIZE = (200, 200)
 CACHE_DIR = Path(os.environ.get("THUMBNAILS_DIR", "/thumbnails"))
 IMAGES_DIR = Path(os.environ.get("IMAGES_DIR", "/images"))
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg"}
-MAX_WORKERS = 4
+# Thumbnail generation is CPU-bound (resample + JPEG encode), so use processes
+MAX_WORKERS = os.cpu_count() or 1
+# At or below this size LANCZOS is visually indistinguishable from BILINEAR
+FAST_RESAMPLE_MAX_SIZE = 200
+# Dimensions cache record: little-endian (width, height) as two uint32
+DIMS_RECORD = struct.Struct("<II")
+# Temp files older than this are leftovers from a crashed write_atomic()
+STALE_TMP_AGE = 60
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG SOFn markers carrying frame dimensions (excludes DHT, JPG, DAC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+
+def get_dimensions_cache_key(image_path: str) -> str:
+    """Generate dimensions cache key using MD5 hash of image path."""
+    return hashlib.md5(f"{image_path}|dims".encode()).hexdigest()
 
 
 def get_dimensions_cache_path(image_path: str) -> Path:
-    """Generate cache path for image dimensions JSON."""
-    hash_key = hashlib.md5(f"{image_path}|dims".encode()).hexdigest()
-    return CACHE_DIR / f"{hash_key}.dims"
+    """Generate cache path for image dimensions record."""
+    return CACHE_DIR / f"{get_dimensions_cache_key(image_path)}.dim"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write data to a temp file in the same directory, then rename into place.
+
+    Readers never see a partially written cache file, even if we crash mid-write.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        # mkstemp creates 0600; keep cache files readable like a plain write would
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_size_fast(path: Path) -> Optional[tuple[int, int]]:
+    """Read (width, height) straight from PNG/JPEG headers without PIL.
+
+    Returns None for unknown formats or headers it can't make sense of.
+    """
+    with path.open("rb") as f:
+        head = f.read(24)
+        if head[:8] == PNG_SIGNATURE and len(head) == 24:
+            return struct.unpack(">II", head[16:24])
+        if head[:2] != b"\xff\xd8":
+            return None
+
+        # Walk JPEG segments until the first start-of-frame
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) != 2 or marker[0] != 0xFF:
+                return None
+            code = marker[1]
+            if code in JPEG_STANDALONE_MARKERS:
+                continue
+            length_bytes = f.read(2)
+            if len(length_bytes) != 2:
+                return None
+            if code in JPEG_SOF_MARKERS:
+                frame = f.read(5)
+                if len(frame) != 5:
+                    return None
+                height, width = struct.unpack(">xHH", frame)
+                return (width, height) if width and height else None
+            f.seek(struct.unpack(">H", length_bytes)[0] - 2, os.SEEK_CUR)
 
 
 def get_image_dimensions(image_path: Path) -> tuple[int, int]:
@@ -28,35 +100,45 @@ def get_image_dimensions(image_path: Path) -> tuple[int, int]:
     """
     cache_path = get_dimensions_cache_path(str(image_path))
 
-    # Check cache first
-    if cache_path.exists():
+    # Check cache first - a single open + fixed-size read, no text parsing
+    try:
+        fd = os.open(cache_path, os.O_RDONLY)
         try:
-            data = cache_path.read_text()
-            w, h = data.split(',')
-            return (int(w), int(h))
-        except Exception:
-            pass  # Cache corrupted, regenerate
+            buf = os.read(fd, DIMS_RECORD.size)
+        finally:
+            os.close(fd)
+        if len(buf) == DIMS_RECORD.size:
+            return DIMS_RECORD.unpack(buf)
+    except OSError:
+        pass  # Not cached or unreadable, regenerate
 
     # Read dimensions from image
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     try:
-        with Image.open(image_path) as img:
-            width, height = img.size
+        size = _read_size_fast(image_path)
+        if size is None:
+            with Image.open(image_path) as img:
+                size = img.size
+        width, height = size
     except Exception as e:
         logger.warning(f"Failed to read dimensions for {image_path}: {e}")
         return (0, 0)  # Frontend will fall back to 16:9
 
     # Cache the result
-    cache_path.write_text(f"{width},{height}")
+    write_atomic(cache_path, DIMS_RECORD.pack(width, height))
 
     return (width, height)
 
 
+def get_cache_key(image_path: str, size: int = 200) -> str:
+    """Generate cache key using MD5 hash of image path and size."""
+    return hashlib.md5(f"{image_path}|size={size}".encode()).hexdigest()
+
+
 def get_cache_path(image_path: str, size: int = 200) -> Path:
-    """Generate cache path using MD5 hash of image path and size."""
-    hash_key = hashlib.md5(f"{image_path}|size={size}".encode()).hexdigest()
-    return CACHE_DIR / f"{hash_key}.jpg"
+    """Generate cache path for a thumbnail."""
+    return CACHE_DIR / f"{get_cache_key(image_path, size)}.jpg"
 
 
 def generate_thumbnail(image_path: Path, size: int = 200) -> bytes:
@@ -73,17 +155,26 @@ def generate_thumbnail(image_path: Path, size: int = 200) -> bytes:
 
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    with Image.open(image_path) as img:
-        img.thumbnail((size, size), Image.Resampling.LANCZOS)
-
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
+    resample = Image.Resampling.BILINEAR if size <= FAST_RESAMPLE_MAX_SIZE else Image.Resampling.LANCZOS
 
-        buffer = BytesIO()
-        img.save(buffer, format="JPEG", quality=85)
-        thumbnail_data = buffer.getvalue()
-
-    cache_path.write_bytes(thumbnail_data)
+    with Image.open(image_path) as img:
+        if img.format == "JPEG" and max(img.size) <= size:
+            # Source is already small enough - serve it as-is, no re-encode
+            thumbnail_data = image_path.read_bytes()
+        else:
+            # Let libjpeg scale during decode (1/2, 1/4, 1/8); no-op for non-JPEG
+            img.draft("RGB", (size * 2, size * 2))
+            img.load()
+            img.thumbnail((size, size), resample)
+
+            if img.mode in ("RGBA", "P"):
+                img = img.convert("RGB")
+
+            buffer = BytesIO()
+            img.save(buffer, format="JPEG", quality=85, optimize=False, progressive=False)
+            thumbnail_data = buffer.getvalue()
+
+    write_atomic(cache_path, thumbnail_data)
     return thumbnail_data
 
 
@@ -108,18 +199,16 @@ def get_all_images() -> list[Path]:
     return images
 
 
-def get_valid_cache_keys(size: int = 200) -> set[str]:
-    """Get set of valid cache keys for current images."""
-    images = get_all_images()
-    # Must match the format used in get_cache_path()
-    return {hashlib.md5(f"{p}|size={size}".encode()).hexdigest() for p in images}
+def _iter_image_paths():
+    """Yield path strings of all valid images under IMAGES_DIR.
 
-
-def get_valid_dims_keys() -> set[str]:
-    """Get set of valid dimension cache keys for current images."""
-    images = get_all_images()
-    # Must match the format used in get_dimensions_cache_path()
-    return {hashlib.md5(f"{p}|dims".encode()).hexdigest() for p in images}
+    Uses os.walk directly so no Path objects are allocated per file; the
+    yielded strings match str(path) for the Paths returned by get_all_images().
+    """
+    for dirpath, _dirnames, filenames in os.walk(IMAGES_DIR):
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() in ALLOWED_EXTENSIONS:
+                yield os.path.join(dirpath, name)
 
 
 def cleanup_orphaned_thumbnails() -> int:
@@ -127,25 +216,35 @@ def cleanup_orphaned_thumbnails() -> int:
     if not CACHE_DIR.exists():
         return 0
 
-    valid_thumb_keys = get_valid_cache_keys()
-    valid_dims_keys = get_valid_dims_keys()
-    removed = 0
+    # Single walk of IMAGES_DIR for both key sets
+    valid_thumb_keys = set()
+    valid_dims_keys = set()
+    for p in _iter_image_paths():
+        valid_thumb_keys.add(get_cache_key(p))
+        valid_dims_keys.add(get_dimensions_cache_key(p))
 
-    # Clean up orphaned thumbnails
-    for thumb_path in CACHE_DIR.glob("*.jpg"):
-        key = thumb_path.stem
-        if key not in valid_thumb_keys:
-            thumb_path.unlink()
-            removed += 1
-            logger.debug(f"Removed orphaned thumbnail: {thumb_path.name}")
-
-    # Clean up orphaned dimension caches
-    for dims_path in CACHE_DIR.glob("*.dims"):
-        key = dims_path.stem
-        if key not in valid_dims_keys:
-            dims_path.unlink()
-            removed += 1
-            logger.debug(f"Removed orphaned dimensions: {dims_path.name}")
+    removed = 0
+    stale_before = time.time() - STALE_TMP_AGE
+
+    # Single pass over the cache dir for thumbnails and dimension caches
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".jpg"):
+                orphaned = name[:-4] not in valid_thumb_keys
+            elif name.endswith(".dim"):
+                orphaned = name[:-4] not in valid_dims_keys
+            elif name.endswith(".dims"):
+                orphaned = True  # Legacy text format, superseded by .dim
+            elif name.endswith(".tmp"):
+                # Left by an interrupted write_atomic(); recent ones may still be in use
+                orphaned = entry.stat().st_mtime < stale_before
+            else:
+                continue
+            if orphaned:
+                os.unlink(entry.path)
+                removed += 1
+                logger.debug(f"Removed orphaned cache file: {name}")
 
     if removed:
         logger.info(f"Cleaned up {removed} orphaned cache file(s)")
@@ -174,7 +273,11 @@ def generate_missing_thumbnails() -> tuple[int, int]:
     generated = 0
     errors = 0
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    # Don't fork: this runs in a worker thread of a process with other live threads
+    # (TV connection pool, event loop), and forked children can inherit held locks
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    mp_context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=mp_context) as executor:
         futures = {executor.submit(_generate_single_thumbnail, p): p for p in missing}
 
         for future in as_completed(futures):
@@ -1,7 +1,10 @@
 import logging
+import random
 import threading
 import time
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, TypeVar
 from samsungtvws import SamsungTVWS
 
 from src.services.tv_thumbnail_cache import TVThumbnailCache
@@ -9,7 +12,216 @@ from src.services.tv_settings import load_settings
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 TV_TIMEOUT = 30
+# Max TV operations in flight at once; the TV's websocket server can't keep up
+# with many concurrent requests, so per-content_id parallelism is capped here
+TV_MAX_CONCURRENCY = 2
+# Max content_ids per get_thumbnail_list call, to stay under TV message size limits
+THUMBNAIL_BATCH_SIZE = 20
+
+# Art-mode connection pool tuning
+POOL_MIN_SIZE = 2  # Open connections kept ready in the background
+POOL_MAX_IDLE = 4  # Extra connections beyond this are closed on release
+POOL_MAX_AGE = 60  # Seconds before an idle connection is assumed dropped by the TV
+POOL_REFILL_INTERVAL = 5
+POOL_REFILL_MAX_BACKOFF = 300  # Cap on the refill delay while the TV is unreachable
+
+# Thumbnail retry backoff: base * 2^attempt, capped, with +/-50% jitter
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_MAX = 4.0
+
+# Seconds a shared read (artwork list, current artwork) is reused by later callers
+READ_RESULT_TTL = 2.0
+
+# Seconds a content_id the TV reported as missing is answered from memory
+THUMBNAIL_MISS_TTL = 60.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """Capped exponential backoff with jitter, so concurrent retries don't pulse in sync."""
+    return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random())
+
+
+def _is_not_found_error(error: Exception) -> bool:
+    """Heuristic for errors that retrying won't fix (content missing on the TV)."""
+    message = str(error).lower()
+    return "not found" in message or "404" in message
+
+
+def _is_connection_closed_error(error: Exception) -> bool:
+    """Heuristic for errors caused by the TV having dropped the websocket."""
+    if isinstance(error, ConnectionError):
+        return True
+    name = type(error).__name__
+    return "ConnectionClosed" in name or "ConnectionFailure" in name
+
+
+class _TVConnPool:
+    """Pool of open art-mode connections, refilled by a background thread.
+
+    Each samsungtvws art() handle owns a websocket that is opened (handshake +
+    channel ready) on first use. Handing out handles that are already open keeps
+    that handshake off the request path. Connections are borrowed exclusively.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        # (idle_since, conn) pairs, oldest on the left, freshest on the right
+        self._idle: deque[tuple[float, Any]] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        # Consecutive failed background opens; while non-zero the refill backs off
+        # and requests stop waking it, until a connection works again
+        self._failures = 0
+        self._thread = threading.Thread(target=self._refill_loop, name="tv-conn-pool", daemon=True)
+        self._thread.start()
+
+    def open(self) -> Any:
+        """Open a new connection, bypassing the idle pool."""
+        conn = self._factory()
+        conn.open()
+        return conn
+
+    @staticmethod
+    def _close_all(conns: list) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _evict_stale_locked(self) -> list:
+        """Remove idle connections older than POOL_MAX_AGE. Caller holds the lock."""
+        cutoff = time.monotonic() - POOL_MAX_AGE
+        stale = []
+        while self._idle and self._idle[0][0] < cutoff:
+            stale.append(self._idle.popleft()[1])
+        return stale
+
+    def acquire(self) -> tuple[Any, bool]:
+        """Borrow the freshest idle connection, opening a new one if none is usable.
+
+        Returns (conn, reused); reused is True when conn came from the idle pool.
+        """
+        conn = None
+        with self._lock:
+            stale = self._evict_stale_locked()
+            if self._idle:
+                conn = self._idle.pop()[1]
+        self._close_all(stale)
+        if not self._failures:
+            self._wake.set()  # Top the pool back up in the background
+        if conn is not None:
+            return conn, True
+        return self.open(), False
+
+    def release(self, conn: Any) -> None:
+        """Return a healthy connection to the pool."""
+        with self._lock:
+            if self._failures:
+                # The TV is reachable again, so resume refilling right away
+                self._failures = 0
+                self._wake.set()
+            if not self._closed and len(self._idle) < POOL_MAX_IDLE:
+                self._idle.append((time.monotonic(), conn))
+                return
+        self._close_all([conn])
+
+    def discard(self, conn: Any) -> None:
+        """Close a connection that failed instead of returning it."""
+        self._close_all([conn])
+
+    def clear(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            conns = [conn for _, conn in self._idle]
+            self._idle.clear()
+        self._close_all(conns)
+
+    def close(self) -> None:
+        """Close idle connections and stop the refill thread."""
+        with self._lock:
+            self._closed = True
+        self.clear()
+        self._wake.set()
+
+    def _refill_loop(self) -> None:
+        # Single refill thread per pool, so refills never stampede the TV
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                stale = self._evict_stale_locked()
+                needed = POOL_MIN_SIZE - len(self._idle)
+            self._close_all(stale)
+
+            for _ in range(needed):
+                try:
+                    conn = self.open()
+                except Exception as e:
+                    with self._lock:
+                        self._failures += 1
+                    _LOGGER.debug(f"Could not pre-open TV connection: {e}")
+                    break
+                self.release(conn)
+
+            failures = self._failures
+            if failures:
+                delay = min(POOL_REFILL_MAX_BACKOFF, POOL_REFILL_INTERVAL * 2 ** failures)
+            else:
+                delay = POOL_REFILL_INTERVAL
+            self._wake.wait(delay)
+            self._wake.clear()
+
+
+class _SingleFlight:
+    """Coalesce concurrent identical calls into one, optionally reusing the result briefly.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight wait on the same Future. Successful results are kept for ttl seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._results: dict[str, tuple[float, Any]] = {}  # key -> (expires_at, result)
+
+    def do(self, key: str, fn: Callable[[], Any], ttl: float = 0.0) -> Any:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[key] = Future()
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            if ttl:
+                self._results[key] = (time.monotonic() + ttl, result)
+        future.set_result(result)
+        return result
+
+    def forget(self, *keys: str) -> None:
+        """Drop reused results, e.g. after a write that changes them."""
+        with self._lock:
+            for key in keys:
+                self._results.pop(key, None)
 
 
 class TVClient:
@@ -20,8 +232,15 @@ class TVClient:
         self._ip = ip
         self._tv: Optional[SamsungTVWS] = None
         self._api_version: Optional[str] = None
-        self._lock = threading.Lock()
-        self._thumbnail_cache = TVThumbnailCache()
+        self._is_new_api_cached: Optional[bool] = None
+        # Guards lazy construction of the SamsungTVWS handle that spawns art() connections
+        self._conn_lock = threading.Lock()
+        self._thumbnail_cache = TVThumbnailCache(ip)
+        # content_id -> monotonic expiry for thumbnails the TV reported as not found
+        self._miss_cache: dict[str, float] = {}
+        self._pool = _TVConnPool(lambda: self._get_tv().art())
+        self._tv_slots = threading.BoundedSemaphore(TV_MAX_CONCURRENCY)
+        self._single_flight = _SingleFlight()
 
     @classmethod
     def get_instance(cls) -> Optional["TVClient"]:
@@ -30,15 +249,14 @@ class TVClient:
 
     @classmethod
     def configure(cls, ip: str) -> "TVClient":
-        """Configure TVClient with a new IP. Clears old connection if switching.
+        """Configure TVClient with a new IP. Closes the old instance's pooled connections.
 
-        Thread-safe: Acquires instance lock before clearing old TV connection.
+        Thumbnail caches are kept per TV, so switching does not clear them.
         """
-        if cls._instance is not None and cls._current_ip != ip:
-            _LOGGER.info(f"Switching TV from {cls._current_ip} to {ip}")
-            with cls._instance._lock:
-                cls._instance._tv = None
-                cls._instance._thumbnail_cache.clear()
+        if cls._instance is not None:
+            if cls._current_ip != ip:
+                _LOGGER.info(f"Switching TV from {cls._current_ip} to {ip}")
+            cls._instance.close()
 
         cls._instance = cls(ip)
         cls._current_ip = ip
@@ -59,32 +277,81 @@ class TVClient:
         return self._ip
 
     def _get_tv(self) -> SamsungTVWS:
-        if self._tv is None:
-            self._tv = SamsungTVWS(self._ip, timeout=TV_TIMEOUT)
-        return self._tv
+        tv = self._tv
+        if tv is not None:
+            return tv
+        with self._conn_lock:
+            if self._tv is None:
+                self._tv = SamsungTVWS(self._ip, timeout=TV_TIMEOUT)
+            return self._tv
+
+    def _with_art(self, op: Callable[[Any], T], retry: bool = True) -> T:
+        """Run op on a borrowed art-mode connection; the connection is dropped if op fails.
+
+        The TV may close an idle pooled connection (standby, wake, Wi-Fi blip),
+        so if op fails on a reused connection with a connection error it is
+        retried once on a newly opened one. Pass retry=False for operations
+        that must not run twice: the TV may have acted before the socket
+        dropped. Waits while TV_MAX_CONCURRENCY operations are already running.
+        """
+        with self._tv_slots:
+            conn, reused = self._pool.acquire()
+            try:
+                result = op(conn)
+            except Exception as e:
+                self._pool.discard(conn)
+                if not (retry and reused and _is_connection_closed_error(e)):
+                    raise
+                _LOGGER.info(f"Pooled TV connection was closed ({e}), retrying on a new connection")
+                conn = self._pool.open()
+                try:
+                    result = op(conn)
+                except BaseException:
+                    self._pool.discard(conn)
+                    raise
+            except BaseException:
+                self._pool.discard(conn)
+                raise
+            self._pool.release(conn)
+            return result
+
+    def close(self) -> None:
+        """Close pooled TV connections."""
+        self._pool.close()
 
     def get_api_version(self) -> str:
         """Get and cache TV API version."""
         if self._api_version is None:
-            tv = self._get_tv()
-            self._api_version = tv.art().get_api_version()
-            _LOGGER.info(f"TV API version: {self._api_version}")
+            self._single_flight.do("api_version", self._fetch_api_version)
         return self._api_version
 
-    def _is_new_api(self) -> bool:
-        """Check if TV uses new API (4.0+) which requires SSL for thumbnails."""
+    def _fetch_api_version(self) -> None:
+        version = self._with_art(lambda art: art.get_api_version())
+        self._is_new_api_cached = self._parse_is_new_api(version)
+        self._api_version = version
+        _LOGGER.info(f"TV API version: {version}")
+
+    @staticmethod
+    def _parse_is_new_api(version: str) -> bool:
         try:
-            version = self.get_api_version()
-            major = int(version.split('.')[0])
-            return major >= 4
+            return int(version.split('.')[0]) >= 4
         except Exception as e:
-            _LOGGER.warning(f"Could not determine API version: {e}, assuming new API")
+            _LOGGER.warning(f"Could not parse API version {version!r}: {e}, assuming new API")
             return True
 
+    def _is_new_api(self) -> bool:
+        """Check if TV uses new API (4.0+) which requires SSL for thumbnails."""
+        if self._is_new_api_cached is None:
+            try:
+                self.get_api_version()
+            except Exception as e:
+                _LOGGER.warning(f"Could not determine API version: {e}, assuming new API")
+                return True
+        return self._is_new_api_cached
+
     def get_status(self) -> dict:
         try:
-            tv = self._get_tv()
-            supported = tv.art().supported()
+            supported = self._with_art(lambda art: art.supported())
             api_version = self.get_api_version()
             return {
                 "connected": True,
@@ -94,108 +361,194 @@ class TVClient:
                 "uses_ssl_thumbnails": self._is_new_api()
             }
         except Exception as e:
-            self._tv = None
+            # Idle connections are likely dead too
+            self._pool.clear()
             self._api_version = None
+            self._is_new_api_cached = None
             return {"connected": False, "error": str(e), "tv_ip": self._ip}
 
     def get_artwork_list(self) -> list:
-        """Get artwork list from TV, deduplicated by content_id."""
-        tv = self._get_tv()
-        artwork = tv.art().available() or []
+        """Get artwork list from TV, deduplicated by content_id.
+
+        Concurrent calls share one TV round-trip, reused for READ_RESULT_TTL seconds.
+        """
+        return self._single_flight.do("artworks", self._fetch_artwork_list, ttl=READ_RESULT_TTL)
 
-        # Deduplicate by content_id (TV sometimes returns duplicates)
-        seen = set()
-        unique = []
+    def _fetch_artwork_list(self) -> list:
+        artwork = self._with_art(lambda art: art.available()) or []
+
+        # Deduplicate by content_id (TV sometimes returns duplicates), keeping the first of each
+        by_id = {}
         for item in artwork:
             content_id = item.get("content_id")
-            if content_id and content_id not in seen:
-                seen.add(content_id)
-                unique.append(item)
+            if content_id:
+                by_id.setdefault(content_id, item)
+        unique = list(by_id.values())
 
-        if len(artwork) != len(unique):
-            _LOGGER.warning(f"Removed {len(artwork) - len(unique)} duplicate(s) from artwork list (raw: {len(artwork)}, unique: {len(unique)})")
+        dropped = len(artwork) - len(unique)
+        if dropped:
+            _LOGGER.warning(f"Removed {dropped} duplicate(s) from artwork list (raw: {len(artwork)}, unique: {len(unique)})")
 
         # Cleanup orphaned thumbnails that are no longer on the TV
-        self._thumbnail_cache.cleanup_orphaned(seen)
+        self._thumbnail_cache.cleanup_orphaned(by_id.keys())
 
         return unique
 
     def get_current_artwork(self) -> dict:
-        tv = self._get_tv()
-        return tv.art().get_current() or {}
+        """Get current artwork. Concurrent calls share one TV round-trip."""
+        return self._single_flight.do("current", self._fetch_current_artwork, ttl=READ_RESULT_TTL)
+
+    def _fetch_current_artwork(self) -> dict:
+        return self._with_art(lambda art: art.get_current()) or {}
 
     def set_current_artwork(self, content_id: str) -> bool:
-        tv = self._get_tv()
-        tv.art().select_image(content_id)
+        self._with_art(lambda art: art.select_image(content_id))
+        self._single_flight.forget("current")
         return True
 
     def delete_artwork(self, content_id: str) -> bool:
-        tv = self._get_tv()
-        tv.art().delete(content_id)
+        self._with_art(lambda art: art.delete(content_id))
+        self._single_flight.forget("artworks", "current")
         self._thumbnail_cache.invalidate(content_id)
+        self._miss_cache.pop(content_id, None)
         return True
 
     def upload_artwork(self, image_data: bytes, display: bool = False) -> dict:
-        tv = self._get_tv()
-        # Always use no matte - we add our own white matte server-side
-        result = tv.art().upload(image_data, matte="none", portrait_matte="none")
+        # Always use no matte - we add our own white matte server-side.
+        # Never retried, as the TV may already have stored the image when the socket
+        # dropped; select is a separate borrow so it can be retried safely.
+        result = self._with_art(
+            lambda art: art.upload(image_data, matte="none", portrait_matte="none"),
+            retry=False
+        )
         if display and result:
             content_id = result.get("content_id")
             if content_id:
-                tv.art().select_image(content_id)
+                self._with_art(lambda art: art.select_image(content_id))
+        self._single_flight.forget("artworks", "current")
         return result or {}
 
     def _fetch_thumbnail_from_tv(self, content_id: str) -> Optional[bytes]:
         """Fetch thumbnail from TV using appropriate API based on TV version."""
-        tv = self._get_tv()
+        is_new_api = self._is_new_api()
 
-        if self._is_new_api():
-            thumbnails = tv.art().get_thumbnail_list([content_id])
+        if is_new_api:
+            thumbnails = self._with_art(lambda art: art.get_thumbnail_list([content_id]))
             if thumbnails:
-                data = list(thumbnails.values())[0]
+                data = next(iter(thumbnails.values()))
                 return bytes(data) if isinstance(data, bytearray) else data
         else:
-            data = tv.art().get_thumbnail(content_id)
+            data = self._with_art(lambda art: art.get_thumbnail(content_id))
             if data:
                 return bytes(data) if isinstance(data, bytearray) else data
 
         return None
 
+    def _is_known_miss(self, content_id: str) -> bool:
+        expires_at = self._miss_cache.get(content_id)
+        if expires_at is None:
+            return False
+        if time.monotonic() < expires_at:
+            return True
+        self._miss_cache.pop(content_id, None)
+        return False
+
     def get_thumbnail(self, content_id: str, retries: int = 2) -> Optional[bytes]:
-        """Get thumbnail with caching, request serialization, and retry logic."""
+        """Get thumbnail with caching, per-content_id request coalescing, and retry logic.
+
+        Returns None if the TV reported the content as not found; that result is
+        remembered for THUMBNAIL_MISS_TTL seconds so repeated requests skip the TV.
+        """
         cached = self._thumbnail_cache.get(content_id)
         if cached:
             return cached
+        if self._is_known_miss(content_id):
+            return None
+
+        # Concurrent requests for the same content_id share one TV fetch
+        return self._thumbnail_cache.get_or_fetch(
+            content_id, lambda: self._fetch_thumbnail_with_retries(content_id, retries)
+        )
 
+    def _fetch_thumbnail_with_retries(self, content_id: str, retries: int = 2) -> Optional[bytes]:
         data = None
         last_error = None
 
         for attempt in range(retries + 1):
             try:
-                with self._lock:
-                    data = self._fetch_thumbnail_from_tv(content_id)
-                    if data:
-                        break
+                data = self._fetch_thumbnail_from_tv(content_id)
+                if data:
+                    break
             except Exception as e:
                 last_error = e
                 _LOGGER.warning(f"Thumbnail fetch attempt {attempt + 1} failed for {content_id}: {e}")
+                if _is_not_found_error(e):
+                    break
                 if attempt < retries:
-                    time.sleep(0.5)
-                    self._tv = None
+                    time.sleep(_retry_delay(attempt))
 
         if data:
-            self._thumbnail_cache.set(content_id, data)
             return data
 
+        if last_error and _is_not_found_error(last_error):
+            _LOGGER.info(f"Thumbnail not found on TV for {content_id}, skipping for {THUMBNAIL_MISS_TTL:.0f}s")
+            self._miss_cache[content_id] = time.monotonic() + THUMBNAIL_MISS_TTL
+            return None
+
         if last_error:
             _LOGGER.error(f"All thumbnail fetch attempts failed for {content_id}: {last_error}")
             raise last_error
 
         return None
 
+    def get_thumbnails(self, content_ids: list[str]) -> dict[str, bytes]:
+        """Get thumbnails for several artworks, fetching cache misses in batches.
+
+        On 4.x+ TVs each batch of misses is a single get_thumbnail_list round-trip.
+        Older TVs only return one thumbnail per request, so misses are fetched
+        individually. Thumbnails that could not be fetched are left out.
+        """
+        wanted = [cid for cid in dict.fromkeys(content_ids) if not self._is_known_miss(cid)]
+        # Each batch's misses are claimed in the cache's in-flight map, so get_thumbnail
+        # calls for the same ids (e.g. grid cards loading meanwhile) wait on that batch
+        batch_size = THUMBNAIL_BATCH_SIZE if self._is_new_api() else 1
+        return self._thumbnail_cache.get_many_or_fetch(wanted, self._fetch_thumbnails_from_tv, batch_size)
+
+    def _fetch_thumbnails_from_tv(self, batch: list[str]) -> dict[str, bytes]:
+        """Fetch one batch of thumbnails, leaving out any that could not be fetched."""
+        if not self._is_new_api():
+            result = {}
+            for content_id in batch:
+                try:
+                    data = self._fetch_thumbnail_with_retries(content_id)
+                except Exception:
+                    continue  # Already logged by _fetch_thumbnail_with_retries
+                if data:
+                    result[content_id] = data
+            return result
+
+        try:
+            thumbnails = self._with_art(lambda art: art.get_thumbnail_list(batch)) or {}
+        except Exception as e:
+            _LOGGER.warning(f"Batch thumbnail fetch failed for {len(batch)} item(s): {e}")
+            return {}
+
+        result = {}
+        requested = set(batch)
+        for filename, data in thumbnails.items():
+            # TV returns keys like "MY_F0001.jpg"; map back to the content_id
+            content_id = filename.rpartition(".")[0] or filename
+            if content_id not in requested:
+                content_id = filename
+            if content_id not in requested or not data:
+                continue
+            result[content_id] = bytes(data) if isinstance(data, bytearray) else data
+        return result
+
     def clear_thumbnail_cache(self) -> None:
         """Clear all cached thumbnails."""
         self._thumbnail_cache.clear()
+        self._miss_cache.clear()
 
 
 def get_tv_client() -> Optional[TVClient]:
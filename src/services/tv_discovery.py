@@ -1,28 +1,47 @@
 import socket
+import select
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from dataclasses import dataclass
-import urllib.request
 import xml.etree.ElementTree as ET
 
+import requests
+from requests.adapters import HTTPAdapter
+
 _LOGGER = logging.getLogger(__name__)
 
 SSDP_ADDR = "239.255.255.250"
 SSDP_PORT = 1900
-SSDP_TIMEOUT = 3
+SSDP_TIMEOUT = 3  # Hard cap on the listening window
+SSDP_SEARCH_REPEATS = 3  # UDP is lossy, so send M-SEARCH more than once
+SSDP_SEARCH_INTERVAL = 0.2
+SSDP_MX = 2  # Devices answer at a random point within this many seconds of an M-SEARCH
+SSDP_IDLE_EXIT = 0.5  # After MX has elapsed, stop once no new device has answered for this long
+MAX_INFO_WORKERS = 8
+
+_UPNP_NS = {"upnp": "urn:schemas-upnp-org:device-1-0"}
+_IP_RE = re.compile(r"http://(\d+\.\d+\.\d+\.\d+)")
 
 # Use ssdp:all to find all UPnP devices, then filter for Samsung
 # Samsung Frame TVs advertise as MediaRenderer, not RemoteControlReceiver
-SEARCH_REQUEST = """M-SEARCH * HTTP/1.1\r
+SEARCH_REQUEST = f"""M-SEARCH * HTTP/1.1\r
 HOST: 239.255.255.250:1900\r
 MAN: "ssdp:discover"\r
-MX: 2\r
+MX: {SSDP_MX}\r
 ST: ssdp:all\r
 \r
 """
 
 
+# Shared across discovery runs and the parallel device-info fetches, so
+# repeat fetches to the same device reuse open connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=MAX_INFO_WORKERS, pool_maxsize=MAX_INFO_WORKERS))
+
+
 @dataclass
 class DiscoveredTV:
     ip: str
@@ -30,33 +49,32 @@ class DiscoveredTV:
     model: Optional[str] = None
 
 
-def _parse_ssdp_response(response: str) -> Optional[str]:
-    """Extract LOCATION URL from SSDP response."""
-    for line in response.split("\r\n"):
-        if line.upper().startswith("LOCATION:"):
-            return line.split(":", 1)[1].strip()
+def _parse_ssdp_response(response: bytes) -> Optional[str]:
+    """Extract LOCATION URL from raw SSDP response bytes."""
+    for line in response.splitlines():
+        if line[:9].lower() == b"location:":
+            return line[9:].strip().decode("ascii", errors="ignore")
     return None
 
 
 def _fetch_device_info(location_url: str) -> Optional[dict]:
     """Fetch device description XML and extract name/model."""
     try:
-        with urllib.request.urlopen(location_url, timeout=2) as response:
-            xml_data = response.read()
+        response = _SESSION.get(location_url, timeout=2)
+        response.raise_for_status()
+        xml_data = response.content
 
         root = ET.fromstring(xml_data)
-        ns = {"upnp": "urn:schemas-upnp-org:device-1-0"}
-
-        device = root.find(".//upnp:device", ns)
+        device = root.find(".//upnp:device", _UPNP_NS)
         if device is None:
             return None
 
-        friendly_name = device.findtext("upnp:friendlyName", "", ns)
-        model_name = device.findtext("upnp:modelName", "", ns)
-        manufacturer = device.findtext("upnp:manufacturer", "", ns)
+        friendly_name = device.findtext("upnp:friendlyName", "", _UPNP_NS)
+        model_name = device.findtext("upnp:modelName", "", _UPNP_NS)
+        manufacturer = device.findtext("upnp:manufacturer", "", _UPNP_NS)
 
-        # Only return Samsung devices
-        if "samsung" not in manufacturer.lower():
+        # Only return Samsung devices (manufacturer is ASCII, so skip Unicode-aware lowering)
+        if b"samsung" not in manufacturer.encode().lower():
             return None
 
         return {
@@ -70,49 +88,74 @@ def _fetch_device_info(location_url: str) -> Optional[dict]:
 
 def _extract_ip_from_url(url: str) -> Optional[str]:
     """Extract IP address from URL like http://192.168.0.105:9197/dmr"""
-    match = re.search(r"http://(\d+\.\d+\.\d+\.\d+)", url)
+    match = _IP_RE.search(url)
     return match.group(1) if match else None
 
 
 def discover_tvs() -> list[DiscoveredTV]:
     """Discover Samsung TVs on the network using SSDP."""
     _LOGGER.info("Starting SSDP discovery...")
+    candidates = {}  # ip -> location URL
     discovered = {}
 
+    sock = None
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind(('', 0))  # Bind to any interface, random port for receiving responses
-        sock.settimeout(SSDP_TIMEOUT)
 
-        # Send discovery request
-        sock.sendto(SEARCH_REQUEST.encode(), (SSDP_ADDR, SSDP_PORT))
+        # Send discovery request a few times; responses queue in the socket meanwhile
+        deadline = time.monotonic() + SSDP_TIMEOUT
+        request = SEARCH_REQUEST.encode()
+        for i in range(SSDP_SEARCH_REPEATS):
+            if i:
+                time.sleep(SSDP_SEARCH_INTERVAL)
+            sock.sendto(request, (SSDP_ADDR, SSDP_PORT))
+        # Any responder may still be inside its MX delay until this point, and
+        # candidates include non-Samsung devices, so never exit early before it
+        earliest_exit = time.monotonic() + SSDP_MX
 
         # Collect responses
+        last_new_ip_time = time.monotonic()
         while True:
-            try:
-                data, addr = sock.recvfrom(1024)
-                response = data.decode("utf-8", errors="ignore")
-
-                location = _parse_ssdp_response(response)
-                if location:
-                    ip = _extract_ip_from_url(location)
-                    if ip and ip not in discovered:
-                        device_info = _fetch_device_info(location)
-                        if device_info:
-                            discovered[ip] = DiscoveredTV(
-                                ip=ip,
-                                name=device_info["name"],
-                                model=device_info.get("model")
-                            )
-                            _LOGGER.info(f"Found TV: {device_info['name']} at {ip}")
-            except socket.timeout:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if candidates and now >= earliest_exit and now - last_new_ip_time > SSDP_IDLE_EXIT:
                 break
 
+            ready, _, _ = select.select([sock], [], [], min(deadline - now, SSDP_IDLE_EXIT))
+            if not ready:
+                continue
+
+            data, addr = sock.recvfrom(1024)
+            location = _parse_ssdp_response(data)
+            if location:
+                ip = _extract_ip_from_url(location)
+                if ip:
+                    if ip not in candidates:
+                        last_new_ip_time = time.monotonic()
+                    candidates[ip] = location
+
     except Exception as e:
         _LOGGER.error(f"SSDP discovery failed: {e}")
     finally:
-        sock.close()
+        if sock is not None:
+            sock.close()
+
+    # Fetch device descriptions in parallel rather than one per response
+    if candidates:
+        with ThreadPoolExecutor(max_workers=min(MAX_INFO_WORKERS, len(candidates))) as executor:
+            infos = list(executor.map(_fetch_device_info, candidates.values()))
+
+        for ip, device_info in zip(candidates, infos):
+            if device_info:
+                discovered[ip] = DiscoveredTV(
+                    ip=ip,
+                    name=device_info["name"],
+                    model=device_info.get("model")
+                )
+                _LOGGER.info(f"Found TV: {device_info['name']} at {ip}")
 
     _LOGGER.info(f"Discovery complete, found {len(discovered)} TV(s)")
     return list(discovered.values())
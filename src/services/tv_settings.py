@@ -1,13 +1,18 @@
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 _LOGGER = logging.getLogger(__name__)
 
 SETTINGS_FILE = Path("/app/data/tv_settings.json")
 
+# Last loaded settings as (file mtime_ns or None if missing, settings)
+_cached: Optional[tuple[Optional[int], "TVSettings"]] = None
+_cache_lock = threading.Lock()
+
 
 @dataclass
 class TVSettings:
@@ -21,25 +26,47 @@ class TVSettings:
 
 
 def load_settings() -> TVSettings:
-    """Load TV settings from disk."""
-    if not SETTINGS_FILE.exists():
-        _LOGGER.info("No TV settings file found, using defaults")
-        return TVSettings()
+    """Load TV settings from disk.
 
+    The parsed result is memoized on the file's mtime, so while the file is
+    unchanged a call costs a single stat().
+    """
+    global _cached
     try:
-        data = json.loads(SETTINGS_FILE.read_text())
-        return TVSettings(
-            selected_tv_ip=data.get("selected_tv_ip"),
-            selected_tv_name=data.get("selected_tv_name"),
-            manual_entry=data.get("manual_entry", False)
-        )
-    except Exception as e:
-        _LOGGER.error(f"Failed to load TV settings: {e}")
-        return TVSettings()
+        mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+
+    with _cache_lock:
+        if _cached is not None and _cached[0] == mtime_ns:
+            return _cached[1]
+
+    if mtime_ns is None:
+        _LOGGER.info("No TV settings file found, using defaults")
+        settings = TVSettings()
+    else:
+        try:
+            data = json.loads(SETTINGS_FILE.read_text())
+            settings = TVSettings(
+                selected_tv_ip=data.get("selected_tv_ip"),
+                selected_tv_name=data.get("selected_tv_name"),
+                manual_entry=data.get("manual_entry", False)
+            )
+        except Exception as e:
+            _LOGGER.error(f"Failed to load TV settings: {e}")
+            settings = TVSettings()
+
+    with _cache_lock:
+        _cached = (mtime_ns, settings)
+    return settings
 
 
 def save_settings(settings: TVSettings) -> None:
     """Save TV settings to disk."""
+    global _cached
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SETTINGS_FILE.write_text(json.dumps(asdict(settings), indent=2))
+    # TVSettings is flat, so __dict__ matches asdict() without its deep copy
+    SETTINGS_FILE.write_text(json.dumps(settings.__dict__, indent=2))
+    with _cache_lock:
+        _cached = None
     _LOGGER.info(f"Saved TV settings: {settings.selected_tv_ip}")
@@ -1,48 +1,314 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Set
+from typing import Callable, Iterable, Optional, Set
+
+from src.services.thumbnails import STALE_TMP_AGE, write_atomic
 
 _LOGGER = logging.getLogger(__name__)
 
 # Use persistent storage alongside local image thumbnails
 THUMBNAILS_DIR = Path(os.environ.get("THUMBNAILS_DIR", "/thumbnails"))
 CACHE_DIR = THUMBNAILS_DIR / "tv"
+# Bytes of recently used thumbnails kept in RAM in front of the disk cache
+MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+# Threads used to overlap unlink latency when removing many orphans at once
+UNLINK_WORKERS = 16
+
+
+def _safe_name(value: str) -> str:
+    """Sanitize a value for use as a file or directory name."""
+    return value.replace("/", "_").replace("\\", "_").replace(":", "_")
+
+
+@functools.lru_cache(maxsize=4096)
+def _relative_path(content_id: str) -> str:
+    """Cache file for content_id, relative to the TV directory: "<h[:2]>/<h>.jpg".
+
+    Hashing gives filesystem-safe, collision-free names; the first two hex
+    chars shard files over up to 256 subdirectories so none grows large.
+    Memoized since get/set/invalidate see the same ids over and over.
+    """
+    h = hashlib.blake2b(content_id.encode(), digest_size=8).hexdigest()
+    return f"{h[:2]}/{h}.jpg"
+
+
+def _remove_unscoped_thumbnails() -> None:
+    """Delete thumbnails stored directly in CACHE_DIR before caches were kept per TV.
+
+    Nothing reads that level any more; after the first run this finds nothing.
+    """
+    removed = 0
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".jpg") and entry.is_file():
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+    if removed:
+        _LOGGER.info(f"Removed {removed} TV thumbnail(s) from the old shared cache directory")
+
+
+# Result handed to get_or_fetch waiters when the batch that claimed the id didn't get it
+_UNFETCHED = object()
+
+
+def _find_orphans(present: Set[str], valid_content_ids: Iterable[str]) -> list[str]:
+    """Return cache files in `present` that belong to none of `valid_content_ids`.
+
+    Hashes can't be reversed, so the comparison happens in the encoded
+    (relative path) form.
+    """
+    valid_names = frozenset(map(_relative_path, valid_content_ids))
+    return [name for name in present if name not in valid_names]
 
 
 class TVThumbnailCache:
-    def __init__(self):
-        CACHE_DIR.mkdir(exist_ok=True)
+    def __init__(self, tv_ip: str):
+        # One directory per TV, so switching TVs never serves another TV's
+        # thumbnails and switching back reuses what was already fetched
+        self._dir = CACHE_DIR / _safe_name(tv_ip)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        _remove_unscoped_thumbnails()
+        # LRU of content_id -> bytes, least recently used first
+        self._mem: OrderedDict[str, bytes] = OrderedDict()
+        self._mem_bytes = 0
+        self._mem_limit = MEMORY_CACHE_BYTES
+        # Guards the LRU and the index of files present on disk
+        self._lock = threading.Lock()
+        # Relative paths of cache files on disk, scanned once and kept in sync
+        # so misses and cleanup never have to touch the filesystem
+        self._present: set[str] = self._scan()
+        # content_id -> Future of a fetch in progress via get_or_fetch
+        self._inflight: dict[str, Future] = {}
+
+    def _mem_put(self, content_id: str, data: bytes) -> None:
+        with self._lock:
+            old = self._mem.pop(content_id, None)
+            if old is not None:
+                self._mem_bytes -= len(old)
+            if len(data) > self._mem_limit:
+                return
+            self._mem[content_id] = data
+            self._mem_bytes += len(data)
+            while self._mem_bytes > self._mem_limit:
+                _, evicted = self._mem.popitem(last=False)
+                self._mem_bytes -= len(evicted)
+
+    def _mem_pop(self, content_id: str) -> None:
+        with self._lock:
+            old = self._mem.pop(content_id, None)
+            if old is not None:
+                self._mem_bytes -= len(old)
+
+    def _forget_file(self, name: str) -> None:
+        """Drop a cache file that turned out to be missing from the index."""
+        with self._lock:
+            self._present.discard(name)
+
+    def _scan(self) -> set[str]:
+        """Return every cached thumbnail as a path relative to the TV directory.
+
+        Stale .tmp files from interrupted writes are removed along the way.
+        """
+        stale_before = time.time() - STALE_TMP_AGE
+        found = set()
 
-    def _cache_path(self, content_id: str) -> Path:
-        # Sanitize content_id for safe filename
-        safe_id = content_id.replace("/", "_").replace("\\", "_")
-        return CACHE_DIR / f"{safe_id}.jpg"
+        def visit(entry: os.DirEntry, name: str) -> None:
+            if entry.name.endswith(".jpg"):
+                found.add(name)
+            elif entry.name.endswith(".tmp") and entry.stat().st_mtime < stale_before:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+        with os.scandir(self._dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        for file in shard:
+                            visit(file, f"{entry.name}/{file.name}")
+        return found
 
     def get(self, content_id: str) -> Optional[bytes]:
-        path = self._cache_path(content_id)
-        if path.exists():
-            _LOGGER.debug(f"Cache hit for thumbnail: {content_id}")
-            return path.read_bytes()
-        return None
+        """Return cached thumbnail bytes, or None if not cached.
+
+        The disk read is attempted directly rather than checked first, so a file
+        removed concurrently is simply a miss.
+        """
+        with self._lock:
+            data = self._mem.get(content_id)
+            if data is not None:
+                self._mem.move_to_end(content_id)
+                return data
+
+        name = _relative_path(content_id)
+        if name not in self._present:
+            return None
+        try:
+            data = (self._dir / name).read_bytes()
+        except FileNotFoundError:
+            self._forget_file(name)
+            return None
+        _LOGGER.debug(f"Cache hit for thumbnail: {content_id}")
+        self._mem_put(content_id, data)
+        return data
+
+    def get_or_fetch(self, content_id: str, fetch: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Return the cached thumbnail, or fetch and cache it.
+
+        Concurrent callers missing on the same content_id share a single
+        fetch() call: the first runs it, the rest wait for its result (or
+        exception). A falsy result is returned but not cached. If the id was
+        claimed by get_many_or_fetch and that batch didn't get it, the waiter
+        fetches it itself.
+        """
+        while True:
+            data = self.get(content_id)
+            if data is not None:
+                return data
+
+            with self._lock:
+                future = self._inflight.get(content_id)
+                owner = future is None
+                if owner:
+                    future = self._inflight[content_id] = Future()
+            if owner:
+                break
+            data = future.result()
+            if data is not _UNFETCHED:
+                return data
+
+        try:
+            # A fetch that finished between our miss and taking ownership has already cached it
+            data = self.get(content_id)
+            if data is None:
+                data = fetch()
+                if data:
+                    self.set(content_id, data)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                del self._inflight[content_id]
+
+    def get_many_or_fetch(
+        self,
+        content_ids: Iterable[str],
+        fetch_many: Callable[[list[str]], dict[str, bytes]],
+        batch_size: int
+    ) -> dict[str, bytes]:
+        """Return cached thumbnails for content_ids, fetching misses batch_size at a time.
+
+        Each batch's misses are claimed in the same in-flight map get_or_fetch
+        uses just before fetch_many() runs for that batch, and are cached and
+        released as soon as it returns, so concurrent single fetches for them
+        wait only on their own batch. Ids another caller is already fetching
+        are waited on instead. fetch_many returns what it could get; missing
+        ids are left out.
+        """
+        result = {}
+        misses = []
+        for content_id in dict.fromkeys(content_ids):
+            data = self.get(content_id)
+            if data is not None:
+                result[content_id] = data
+            else:
+                misses.append(content_id)
+
+        waiting: dict[str, Future] = {}
+        for i in range(0, len(misses), batch_size):
+            claimed: dict[str, Future] = {}
+            for content_id in misses[i:i + batch_size]:
+                # May have been fetched by someone else while earlier batches ran
+                data = self.get(content_id)
+                if data is not None:
+                    result[content_id] = data
+                    continue
+                with self._lock:
+                    future = self._inflight.get(content_id)
+                    if future is None:
+                        claimed[content_id] = self._inflight[content_id] = Future()
+                    else:
+                        waiting[content_id] = future
+            if claimed:
+                result.update(self._fetch_claimed(claimed, fetch_many))
+
+        for content_id, future in waiting.items():
+            try:
+                data = future.result()
+            except Exception:
+                continue  # Reported to the caller that owned the fetch
+            if data and data is not _UNFETCHED:
+                result[content_id] = data
+        return result
+
+    def _fetch_claimed(
+        self,
+        claimed: dict[str, Future],
+        fetch_many: Callable[[list[str]], dict[str, bytes]]
+    ) -> dict[str, bytes]:
+        """Fetch and cache claimed ids, then release their claims and resolve their futures."""
+        fetched = {}
+        stored = {}
+        try:
+            fetched = fetch_many(list(claimed))
+        finally:
+            for content_id in claimed:
+                data = fetched.get(content_id)
+                if data:
+                    self.set(content_id, data)
+                    stored[content_id] = data
+            # Drop the claims before resolving, so waiters retrying an unfetched id don't find them
+            with self._lock:
+                for content_id in claimed:
+                    del self._inflight[content_id]
+            for content_id, future in claimed.items():
+                future.set_result(stored.get(content_id, _UNFETCHED))
+        return stored
 
     def set(self, content_id: str, data: bytes) -> None:
-        path = self._cache_path(content_id)
-        path.write_bytes(data)
+        name = _relative_path(content_id)
+        path = self._dir / name
+        path.parent.mkdir(exist_ok=True)
+        write_atomic(path, data)
+        with self._lock:
+            self._present.add(name)
+        self._mem_put(content_id, data)
         _LOGGER.debug(f"Cached thumbnail: {content_id}")
 
     def invalidate(self, content_id: str) -> None:
-        path = self._cache_path(content_id)
-        if path.exists():
-            path.unlink()
-            _LOGGER.debug(f"Invalidated cache for: {content_id}")
+        self._mem_pop(content_id)
+        name = _relative_path(content_id)
+        with self._lock:
+            self._present.discard(name)
+        (self._dir / name).unlink(missing_ok=True)
+        _LOGGER.debug(f"Invalidated cache for: {content_id}")
 
     def clear(self) -> None:
         """Clear all cached thumbnails."""
-        for path in CACHE_DIR.glob("*.jpg"):
-            path.unlink()
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+            names = list(self._present)
+            self._present.clear()
+        for name in names:
+            (self._dir / name).unlink(missing_ok=True)
         _LOGGER.info("Cleared all thumbnail cache")
 
     def cleanup_orphaned(self, valid_content_ids: set[str]) -> int:
@@ -54,16 +320,35 @@ class TVThumbnailCache:
         Returns:
             Number of orphaned thumbnails removed
         """
-        removed = 0
-        for path in CACHE_DIR.glob("*.jpg"):
-            # Extract content_id from filename (reverse of _cache_path sanitization)
-            cached_id = path.stem.replace("_", "/")
-            # Also try without replacement in case content_id had no slashes
-            if cached_id not in valid_content_ids and path.stem not in valid_content_ids:
-                path.unlink()
-                removed += 1
-                _LOGGER.debug(f"Removed orphaned thumbnail: {path.stem}")
-        
+        with self._lock:
+            for content_id in [cid for cid in self._mem if cid not in valid_content_ids]:
+                self._mem_bytes -= len(self._mem.pop(content_id))
+            orphans = _find_orphans(self._present, valid_content_ids)
+            self._present.difference_update(orphans)
+        if not orphans:
+            return 0
+
+        # Unlink relative to one open directory fd, so each delete skips path lookup
+        dir_fd = os.open(self._dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+        def unlink(name: str) -> bool:
+            try:
+                os.unlink(name, dir_fd=dir_fd)
+            except FileNotFoundError:
+                return False
+            _LOGGER.debug(f"Removed orphaned thumbnail: {name}")
+            return True
+
+        try:
+            if len(orphans) == 1:
+                removed = int(unlink(orphans[0]))
+            else:
+                # unlink releases the GIL, so threads overlap the syscalls on slow filesystems
+                with ThreadPoolExecutor(max_workers=min(UNLINK_WORKERS, len(orphans))) as executor:
+                    removed = sum(executor.map(unlink, orphans))
+        finally:
+            os.close(dir_fd)
+
         if removed:
             _LOGGER.info(f"Cleaned up {removed} orphaned TV thumbnail(s)")
         return removed
@@ -5,21 +5,40 @@ Samsung Frame TV Art Mode Verification Script
 Tests connectivity and art mode functionality with the Samsung Frame TV.
 """
 
+import argparse
+import asyncio
 import json
 import os
 import sys
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 TV_IP = os.environ.get("TV_IP", "192.168.0.105")
 TIMEOUT = 10
+# Indent JSON output; turned off by --no-pretty for automated runs
+PRETTY = True
+
+_RULE = "=" * 60
+
+
+def _dumps(data, pretty: bool = False) -> str:
+    """Serialize result data to JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=str, option=option).decode()
+    return json.dumps(data, indent=4 if pretty else None, default=str)
 
 
 def print_header(title: str) -> None:
     """Print a formatted section header."""
-    print("\n" + "=" * 60)
+    print(f"\n{_RULE}")
     print(f"  {title}")
-    print("=" * 60)
+    print(_RULE)
 
 
 def print_result(name: str, success: bool, data=None, error=None) -> None:
@@ -30,7 +49,7 @@ def print_result(name: str, success: bool, data=None, error=None) -> None:
     if data is not None:
         print("  Result:")
         if isinstance(data, (dict, list)):
-            print(f"  {json.dumps(data, indent=4, default=str)}")
+            print(f"  {_dumps(data, pretty=PRETTY)}")
         else:
             print(f"  {data}")
 
@@ -38,8 +57,36 @@ def print_result(name: str, success: bool, data=None, error=None) -> None:
         print(f"  Error: {error}")
 
 
+async def _run_art_checks(tv) -> list:
+    """Run the independent art-mode queries concurrently.
+
+    Returns results in call order, with an exception object in place of any
+    call that failed.
+    """
+    loop = asyncio.get_running_loop()
+    # tv.art() builds a new helper each call. supported() is a REST query that
+    # never touches the art websocket, so it can share a helper with one
+    # websocket call; the other websocket call needs its own connection, as
+    # the two run at the same time.
+    art = tv.art()
+    calls = [
+        art.supported,
+        art.available,
+        lambda: tv.art().get_current(),
+    ]
+    return await asyncio.gather(
+        *(loop.run_in_executor(None, call) for call in calls),
+        return_exceptions=True
+    )
+
+
 def main() -> int:
     """Run TV verification tests."""
+    global PRETTY
+    parser = argparse.ArgumentParser(description="Verify Samsung Frame TV art mode communication.")
+    parser.add_argument("--no-pretty", action="store_true", help="print JSON results without indentation")
+    PRETTY = not parser.parse_args().no_pretty
+
     print_header("Samsung Frame TV Art Mode Verification")
     print(f"Timestamp: {datetime.now().isoformat()}")
     print(f"Target TV: {TV_IP}")
@@ -72,16 +119,19 @@ def main() -> int:
         print("\n\033[91mCannot proceed without connection. Exiting.\033[0m")
         return 1
 
+    # Query the TV once for all art mode checks, then report in order
+    supported, available, current = asyncio.run(_run_art_checks(tv))
+
     # Check art mode support
     print_header("3. Art Mode Support")
     art_supported = False
-    try:
-        art_supported = tv.art().supported()
+    if isinstance(supported, Exception):
+        print_result("art().supported()", False, error=str(supported))
+        results["failed"] += 1
+    else:
+        art_supported = supported
         print_result("art().supported()", True, data=art_supported)
         results["passed"] += 1
-    except Exception as e:
-        print_result("art().supported()", False, error=str(e))
-        results["failed"] += 1
 
     if not art_supported:
         print("\n\033[93mWarning: Art mode not supported or TV may be off.\033[0m")
@@ -92,28 +142,26 @@ def main() -> int:
 
     # Get available artwork
     print_header("4. Available Artwork")
-    try:
-        available = tv.art().available()
+    if isinstance(available, Exception):
+        print_result("art().available()", False, error=str(available))
+        results["failed"] += 1
+    else:
         count = len(available) if isinstance(available, list) else "unknown"
         print_result("art().available()", True, data=f"Found {count} artwork(s)")
         if available and isinstance(available, list) and len(available) > 0:
             print("  First 3 items:")
             for item in available[:3]:
-                print(f"    - {json.dumps(item, default=str)}")
+                print(f"    - {_dumps(item)}")
         results["passed"] += 1
-    except Exception as e:
-        print_result("art().available()", False, error=str(e))
-        results["failed"] += 1
 
     # Get current artwork
     print_header("5. Current Artwork")
-    try:
-        current = tv.art().get_current()
+    if isinstance(current, Exception):
+        print_result("art().get_current()", False, error=str(current))
+        results["failed"] += 1
+    else:
         print_result("art().get_current()", True, data=current)
         results["passed"] += 1
-    except Exception as e:
-        print_result("art().get_current()", False, error=str(e))
-        results["failed"] += 1
 
     # Summary
     print_header("Summary")